@@ -0,0 +1,31 @@
+import json
+import re
+
+# orjson is optional; it parses in C and is noticeably faster than the stdlib json module.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same exception either way.
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# orjson turns integers wider than 64 bits into floats, while the stdlib keeps them exact.
+# Any such integer has at least 20 digits, so documents with a run that long go to the stdlib parser.
+_LONG_DIGIT_RUN_RE = re.compile(rb"\d{20}")
+
+def load_json(f):
+    """
+    Parses JSON from a file object opened in binary mode ('rb'), using orjson when it is installed.
+    Accepts and returns exactly what the stdlib json module does: input orjson rejects or would parse
+    differently (NaN/Infinity, out-of-range floats, a UTF-8 BOM, integers over 64 bits) is parsed by the stdlib.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    if not HAS_ORJSON:
+        return json.load(f)
+    data = f.read()
+    if not _LONG_DIGIT_RUN_RE.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass # Let the stdlib decide, and raise its error if the input really is malformed
+    return json.loads(data)
@@ -1,23 +1,77 @@
 import argparse
+import asyncio
+import contextlib
 import os
 import sys
-import time
-import json
 
 # Adjust imports for the new directory structure if these files are also moved
 # For now, assume they will be in the same directory or Python path is handled.
-from .stm32_flasher import flash_firmware
+from .stm32_flasher import flash_firmware, DEFAULT_BOOT_DELAY_S
 from .pin_emulator import emulate_hw_pins_from_file, GPIOControllerError
 from .serial_receiver import SerialReceiver, DEFAULT_SERIAL_PORT, DEFAULT_BAUD_RATE, SerialReceiverError
 from .gpio_controller import GPIOController, GPIOControllerError as GPIOInitError
 from .output_checker import check_output
+from .json_utils import load_json
 
-def main():
+def _crc32_arg(value):
+    """argparse type for a CRC32 given in hex, with or without a 0x prefix."""
+    try:
+        crc32 = int(value, 16)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CRC32 value: '{value}'")
+    if not 0 <= crc32 <= 0xFFFFFFFF:
+        raise argparse.ArgumentTypeError(f"CRC32 value out of range: '{value}'")
+    return crc32
+
+async def _flash_and_boot(args):
+    """
+    Flashes the STM32 from a worker thread, then waits out its boot delay.
+    Returns True on success (or if flashing is skipped), False if flashing failed.
+    """
+    if args.skip_flash:
+        return True
+    if not await asyncio.to_thread(flash_firmware, args.code_to_test, stlink_command=args.st_flash_cmd,
+                                   address=args.flash_address, serial_number=args.stlink_serial,
+                                   expected_crc32=args.firmware_crc32, verbose=args.verbose):
+        return False
+    print("Flashing reported success. Delaying for STM32 boot...")
+    await asyncio.sleep(DEFAULT_BOOT_DELAY_S)
+    return True
+
+async def _wait_for_shared_pins(args, ser_rcv, shared_pins):
+    """
+    For boards whose input pins are driven once for the whole batch by the caller: opens the serial port,
+    reports this board ready and waits for the shared pin sequence to finish.
+    Returns (emulation_result, connect_result) like the gather in main_async, with exceptions returned rather than raised.
+    """
+    try:
+        connect_result = await asyncio.to_thread(ser_rcv.connect)
+    except Exception as e:
+        return None, e
+    print("Serial port ready. Waiting for the shared pin sequence to be driven for all boards...")
+    try:
+        if not await asyncio.to_thread(shared_pins.board_ready):
+            return None, connect_result
+        with open(args.input_values, 'rb') as f: # Parsed here for check_output's fallback, as emulation would return it
+            return load_json(f), connect_result
+    except Exception as e:
+        return e, connect_result
+
+def main(argv=None, gpio_ctrl=None, shared_pins=None):
+    """
+    Parses argv (sys.argv[1:] if None) and runs a single HIL test, exiting via sys.exit with the result code.
+    gpio_ctrl: an already initialized GPIOController to reuse, e.g. one shared by a batch of boards.
+    Only the pins this test configures are released afterwards; the controller itself stays usable.
+    shared_pins: for a batch of boards wired to the same pins; its board_ready() is called once this board is
+    flashed and its serial port is open, and returns True after the caller has driven the pin sequence for all boards.
+    No GPIO is touched here in that case.
+    """
     parser = argparse.ArgumentParser(
         description="HIL Test Runner: Flashes STM32, emulates inputs, receives serial, checks output.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument("--code-to-test", required=True, help="Path to STM32 firmware (.bin/.hex).")
+    parser.add_argument("--firmware-crc32", type=_crc32_arg, default=None, help="Expected CRC32 of the firmware file in hex (e.g. 0x1A2B3C4D). Flashing is refused if it does not match.")
     parser.add_argument("--input-values", required=True, help="Path to JSON for hardware input actions (e.g., GPIO toggle).")
     parser.add_argument("--expected-values", help="Path to JSON for expected serial output. If not provided, output checking is skipped.")
 
@@ -29,56 +83,87 @@ def main():
     parser.add_argument("--stlink-serial", default=None, help="ST-Link programmer serial number. If not provided, st-flash will use the first one found.")
     parser.add_argument("--gpio-mode", default="BCM", choices=["BCM", "BOARD"], help="GPIO pin numbering mode (BCM or BOARD).")
     parser.add_argument("--receive-timeout", type=int, default=10, help="Overall timeout in seconds for receiving serial data.")
+    parser.add_argument("--verbose", action="store_true", help="Print run configuration, st-flash commands and their output.")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    asyncio.run(main_async(args, gpio_ctrl, shared_pins))
 
+async def main_async(args, gpio_ctrl=None, shared_pins=None):
     print("--- HIL Test Run Start ---")
-    print(f"Firmware: {args.code_to_test}")
-    print(f"Input Actions: {args.input_values}")
-    if args.expected_values:
-        print(f"Expected Values: {args.expected_values}")
-    else:
-        print("Expected Values: Not provided, output checking will be skipped.")
-    print(f"Serial: {args.serial_port} @ {args.baud_rate}bps")
-    if args.stlink_serial:
-        print(f"ST-Link Serial: {args.stlink_serial}")
-    print(f"GPIO Mode: {args.gpio_mode}")
+    if args.verbose:
+        print(f"Firmware: {args.code_to_test}")
+        print(f"Input Actions: {args.input_values}")
+        if args.expected_values:
+            print(f"Expected Values: {args.expected_values}")
+        else:
+            print("Expected Values: Not provided, output checking will be skipped.")
+        print(f"Serial: {args.serial_port} @ {args.baud_rate}bps")
+        if args.stlink_serial:
+            print(f"ST-Link Serial: {args.stlink_serial}")
+        print(f"GPIO Mode: {args.gpio_mode}")
 
     script_ran_to_completion = False
     test_passed = False
 
     if not args.skip_flash:
-        print("\n--- Step 1: Flashing STM32 ---")
+        print("\n--- Step 1: Flashing STM32" + (" (GPIO setup runs alongside) ---" if shared_pins is None else " ---"))
         if not os.path.exists(args.code_to_test):
             print(f"Fatal Error: Firmware file '{args.code_to_test}' not found.")
             sys.exit(1)
-        try:
-            if not flash_firmware(args.code_to_test, stlink_command=args.st_flash_cmd, address=args.flash_address, serial_number=args.stlink_serial):
-                print("STM32 flashing reported failure. Aborting.")
-                sys.exit(1)
-            print("Flashing reported success. Delaying for STM32 boot...")
-            time.sleep(3)
-        except Exception as e:
-            print(f"Fatal Error during flashing: {e}")
-            sys.exit(1)
     else:
         print("\n--- Step 1: Flashing STM32 (Skipped) ---")
 
+    if shared_pins is not None:
+        gpio_setup = asyncio.sleep(0, result=None) # The caller drives the shared pins
+    elif gpio_ctrl is not None:
+        gpio_setup = asyncio.sleep(0, result=gpio_ctrl) # Already initialized by the caller
+    else:
+        gpio_setup = asyncio.to_thread(GPIOController, mode_str=args.gpio_mode)
+    # Flashing and the boot delay are independent of GPIO setup, so run them together
+    flash_result, gpio_result = await asyncio.gather(_flash_and_boot(args), gpio_setup, return_exceptions=True)
+    if flash_result is not True:
+        if isinstance(flash_result, Exception):
+            print(f"Fatal Error during flashing: {flash_result}")
+        else:
+            print("STM32 flashing reported failure. Aborting.")
+        if isinstance(gpio_result, GPIOController):
+            gpio_result.cleanup()
+        sys.exit(1)
+
     received_data = None
+    expected_config = None # Parsed once here and handed to check_output
 
     try:
-        with GPIOController(mode_str=args.gpio_mode) as gpio_ctrl:
-            print("\n--- Step 2: Emulating Hardware Pin Inputs ---")
-            input_actions_config = emulate_hw_pins_from_file(args.input_values, gpio_ctrl)
-            if input_actions_config is None:
-                print("Hardware pin input emulation failed critically. Aborting.")
-                sys.exit(1)
-            
-            print("Pin emulation sequence complete. Waiting briefly for STM32 to process...")
-            time.sleep(1)
+        if isinstance(gpio_result, Exception):
+            raise gpio_result
+        with gpio_result if gpio_result is not None else contextlib.nullcontext() as gpio_ctrl:
+            ser_rcv = SerialReceiver(port=args.serial_port, baudrate=args.baud_rate)
+            if shared_pins is not None:
+                print("\n--- Step 2: Emulating Hardware Pin Inputs (driven once for all boards) ---")
+                emulation_result, connect_result = await _wait_for_shared_pins(args, ser_rcv, shared_pins)
+            else:
+                print("\n--- Step 2: Emulating Hardware Pin Inputs ---")
+                # Open the serial port while the pin sequence runs so it is ready as soon as emulation finishes
+                emulation_result, connect_result = await asyncio.gather(
+                    asyncio.to_thread(emulate_hw_pins_from_file, args.input_values, gpio_ctrl),
+                    asyncio.to_thread(ser_rcv.connect),
+                    return_exceptions=True
+                )
+            if isinstance(connect_result, Exception):
+                raise connect_result
+
+            with ser_rcv:
+                if isinstance(emulation_result, Exception):
+                    raise emulation_result
+                input_actions_config = emulation_result
+                if input_actions_config is None:
+                    print("Hardware pin input emulation failed critically. Aborting.")
+                    sys.exit(1)
+
+                print("Pin emulation sequence complete. Waiting briefly for STM32 to process...")
+                await asyncio.sleep(1)
 
-            print("\n--- Step 3: Receiving Output from STM32 (via Serial) ---")
-            with SerialReceiver(port=args.serial_port, baudrate=args.baud_rate) as ser_rcv:
+                print("\n--- Step 3: Receiving Output from STM32 (via Serial) ---")
                 if not ser_rcv.is_connected():
                      print(f"Fatal Error: Failed to connect to serial port {args.serial_port}. Aborting.")
                      sys.exit(1)
@@ -86,14 +171,19 @@ def main():
                 reception_mode_for_receiver = "lines"
                 if args.expected_values and os.path.exists(args.expected_values):
                     try:
-                        with open(args.expected_values, 'r') as f_exp:
-                            expected_config_for_mode = json.load(f_exp)
-                        reception_mode_for_receiver = expected_config_for_mode.get("reception_mode", "lines")
-                        print(f"Using reception mode '{reception_mode_for_receiver}' from expected_values file.")
+                        with open(args.expected_values, 'rb') as f_exp:
+                            expected_config = load_json(f_exp)
+                        reception_mode_for_receiver = expected_config.get("reception_mode", "lines")
+                        if args.verbose:
+                            print(f"Using reception mode '{reception_mode_for_receiver}' from expected_values file.")
                     except Exception as e:
                         print(f"Warning: Could not read reception_mode from {args.expected_values}: {e}. Defaulting to 'lines'.")
 
-                print(f"Listening for serial data (mode: {reception_mode_for_receiver}) for up to {args.receive_timeout} seconds...")
+                if args.verbose:
+                    print(f"Listening for serial data (mode: {reception_mode_for_receiver}) for up to {args.receive_timeout} seconds...")
+                # The port was opened early; drop what arrived during emulation and the settle delay so only output
+                # from here on is checked, the same capture window as opening the port at this point
+                ser_rcv.ser.reset_input_buffer()
                 received_data = ser_rcv.receive_data(
                     mode=reception_mode_for_receiver,
                     overall_timeout_s=args.receive_timeout,
@@ -110,7 +200,9 @@ def main():
                     print("No data was received from STM32. Output checking cannot proceed.")
                     test_passed = False
                 else:
-                    test_passed = check_output(received_data, args.expected_values, input_actions_config)
+                    test_passed = check_output(received_data, args.expected_values,
+                                               input_data_for_fallback=input_actions_config,
+                                               expected_config=expected_config)
         else:
             print("No expected values file provided. Output checking skipped.")
             if received_data is not None:
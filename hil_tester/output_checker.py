@@ -2,6 +2,34 @@
 import json
 import re
 
+from .json_utils import load_json
+
+# numpy is optional; without it numeric arrays are compared element by element
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+NUMPY_MIN_ARRAY_LEN = 64 # Shorter arrays are not worth the conversion to numpy
+_MAX_EXACT_FLOAT_INT = 2 ** 53 # Larger ints cannot be compared exactly as float64
+
+def _is_numeric_sequence(values):
+    # bools are excluded on purpose: they take the element-wise path, which treats True == 1 like Python does
+    return all(type(v) is float or (type(v) is int and -_MAX_EXACT_FLOAT_INT <= v <= _MAX_EXACT_FLOAT_INT) for v in values)
+
+def _numeric_arrays_equal(received_list, expected_list):
+    """
+    Vectorized equality check for two equal-length lists of plain numbers.
+    Returns True only if both are numeric and match exactly. False means the caller should fall back
+    to the element-wise comparison, which also reports the individual discrepancies.
+    """
+    if not (_is_numeric_sequence(expected_list) and _is_numeric_sequence(received_list)):
+        return False
+    expected_arr = np.fromiter(expected_list, dtype=np.float64, count=len(expected_list))
+    received_arr = np.fromiter(received_list, dtype=np.float64, count=len(received_list))
+    return bool(np.array_equal(expected_arr, received_arr))
+
 def compare_json_structures(received_obj, expected_obj, path="root"):
     """
     Recursively compares a received Python object (from parsed JSON) against an
@@ -37,6 +65,8 @@ def compare_json_structures(received_obj, expected_obj, path="root"):
         # would be handled if `expected_obj` was a dict like `{"type": "array_contains_all", ...}`
         if len(received_obj) != len(expected_obj):
             discrepancies.append(f"Array length mismatch at '{path}'. Expected {len(expected_obj)}, Got {len(received_obj)}.")
+        elif HAS_NUMPY and len(expected_obj) >= NUMPY_MIN_ARRAY_LEN and _numeric_arrays_equal(received_obj, expected_obj):
+            pass # Long numeric arrays that match exactly need no per-element checks
         else:
             for i, (rec_item, exp_item) in enumerate(zip(received_obj, expected_obj)):
                 discrepancies.extend(compare_json_structures(rec_item, exp_item, f"{path}[{i}]"))
@@ -114,9 +144,13 @@ def compare_json_structures(received_obj, expected_obj, path="root"):
 
 def check_output(received_data_obj_or_list_of_lines: any, # Can be parsed JSON (dict/list) or list of lines
                  expected_json_path: str = None,
-                 input_data_for_fallback: dict = None): # Fallback not really used with pin emulation
+                 input_data_for_fallback: dict = None, # Fallback not really used with pin emulation
+                 expected_config: dict = None): # Already-parsed expected_json_path contents, if the caller has them
     """
     Checks received data against expected values.
+    If expected_config is given, it is used as-is and expected_json_path is not re-read.
+    input_data_for_fallback is the input actions dict already parsed by emulate_hw_pins_from_file;
+    it is only ever consumed as a dict, never re-loaded from its JSON file.
     """
     print("\n--- Output Checking ---")
     
@@ -125,16 +159,19 @@ def check_output(received_data_obj_or_list_of_lines: any, # Can be parsed JSON (
         print("Output Checking Summary: SKIPPED (no expectations defined)")
         return True # Or False if strictness requires expectations
 
-    try:
-        with open(expected_json_path, 'r') as f:
-            expected_config = json.load(f)
-        print(f"Loaded expected values from: {expected_json_path}")
-    except FileNotFoundError:
-        print(f"Error: Expected values JSON file not found at '{expected_json_path}'.")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"Error: Could not decode Expected JSON file '{expected_json_path}': {e}")
-        return False
+    if expected_config is None:
+        try:
+            with open(expected_json_path, 'rb') as f:
+                expected_config = load_json(f)
+            print(f"Loaded expected values from: {expected_json_path}")
+        except FileNotFoundError:
+            print(f"Error: Expected values JSON file not found at '{expected_json_path}'.")
+            return False
+        except json.JSONDecodeError as e:
+            print(f"Error: Could not decode Expected JSON file '{expected_json_path}': {e}")
+            return False
+    else:
+        print(f"Using already loaded expected values from: {expected_json_path}")
 
     reception_mode = expected_config.get("reception_mode", "lines")
     expected_responses_definition = expected_config.get("expected_responses")
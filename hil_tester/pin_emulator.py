@@ -1,6 +1,7 @@
 import json
 import time
 from .gpio_controller import GPIOController, GPIOControllerError
+from .json_utils import load_json
 
 def emulate_hw_pins_from_file(input_json_path: str, gpio_ctrl: GPIOController):
     """
@@ -8,8 +9,8 @@ def emulate_hw_pins_from_file(input_json_path: str, gpio_ctrl: GPIOController):
     Returns the parsed input_data on success or for continuing partially, None on critical parse error.
     """
     try:
-        with open(input_json_path, 'r') as f:
-            input_data = json.load(f)
+        with open(input_json_path, 'rb') as f:
+            input_data = load_json(f)
     except FileNotFoundError:
         print(f"PinEmulator Error: Hardware Input Actions JSON file not found at '{input_json_path}'")
         return None
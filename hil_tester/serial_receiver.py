@@ -176,7 +176,8 @@ class SerialReceiver:
         # SIGINT handling setup
         self._original_sigint_handler = signal(SIGINT, self._graceful_exit_handler_sigint)
         try:
-            self.connect()
+            if not self.is_connected(): # May already be open if connect() was called ahead of the with block
+                self.connect()
         except SerialReceiverError as e:
             # Restore original SIGINT handler if connect fails before __exit__ is called
             if self._original_sigint_handler:
@@ -1,10 +1,82 @@
 import subprocess
+import mmap
 import os
+import re
+import shlex
+import shutil
+import zlib
+from collections import deque
 
 DEFAULT_STLINK_FLASH_COMMAND = "st-flash"
 DEFAULT_FLASH_ADDRESS = "0x08000000"
+DEFAULT_BOOT_DELAY_S = 3
+# One case-insensitive pass per line instead of lower()-ing it and searching for each message separately
+_SUCCESS_RE = re.compile(r"verify success|flash written and verified successfully", re.IGNORECASE)
+_ERROR_RE = re.compile(r"error", re.IGNORECASE)
+OUTPUT_TAIL_LINES = 20 # Lines of st-flash output kept for failure reports when not verbose
 
-def flash_firmware(firmware_path, stlink_command=DEFAULT_STLINK_FLASH_COMMAND, address=DEFAULT_FLASH_ADDRESS, serial_number=None):
+# Resolved once so repeated flashes (e.g. one per board) skip the PATH search
+_ST_FLASH_PATH = shutil.which(DEFAULT_STLINK_FLASH_COMMAND)
+
+def _resolve_stlink_command(stlink_command):
+    """
+    Returns the absolute path of the st-flash command, reusing the cached lookup for the default command.
+    Raises FileNotFoundError if the command cannot be found.
+    """
+    if stlink_command == DEFAULT_STLINK_FLASH_COMMAND and _ST_FLASH_PATH:
+        return _ST_FLASH_PATH
+    resolved_path = shutil.which(stlink_command)
+    if resolved_path is None:
+        raise FileNotFoundError(f"Flashing command '{stlink_command}' not found.")
+    return resolved_path
+
+def _stream_command(command, label, verbose=False):
+    """
+    Runs a command with stderr merged into stdout, checking each output line as it arrives.
+    Lines are printed as they stream when verbose; otherwise only the last few are kept for error reports.
+    Returns a (return_code, success_seen, error_seen, output_tail) tuple.
+    """
+    success_seen = False
+    error_seen = False
+    output_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if verbose:
+                print(f"  [{label}] {line}")
+            output_tail.append(line)
+            if not success_seen and _SUCCESS_RE.search(line):
+                success_seen = True
+            if not error_seen and _ERROR_RE.search(line):
+                error_seen = True
+        return_code = proc.wait()
+    return return_code, success_seen, error_seen, output_tail
+
+def _print_output_tail(label, output_tail):
+    print(f"Last {label} output:")
+    for line in output_tail:
+        print(f"  [{label}] {line}")
+
+def _firmware_crc32(firmware_path):
+    """
+    Computes the CRC32 of the firmware image through a read-only memory map, hinting the kernel to read it ahead
+    sequentially, so the image is never copied into a bytes object and its pages are warm when st-flash reads them.
+    """
+    fd = os.open(firmware_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0: # A zero-length file cannot be mapped
+            return zlib.crc32(b"")
+        if hasattr(os, "posix_fadvise"): # Not available on Windows/macOS
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as firmware_image:
+            return zlib.crc32(firmware_image)
+    finally:
+        os.close(fd)
+
+def flash_firmware(firmware_path, stlink_command=DEFAULT_STLINK_FLASH_COMMAND, address=DEFAULT_FLASH_ADDRESS, serial_number=None,
+                   expected_crc32=None, verbose=False):
     """
     Flashes the STM32 with the provided firmware file using st-flash.
     Args:
@@ -12,6 +84,8 @@ def flash_firmware(firmware_path, stlink_command=DEFAULT_STLINK_FLASH_COMMAND, a
         stlink_command (str): The st-flash command (e.g., 'st-flash').
         address (str): The memory address to write to (e.g., '0x08000000').
         serial_number (str, optional): ST-Link programmer serial number. Defaults to None.
+        expected_crc32 (int, optional): CRC32 the firmware file must match before it is flashed. Defaults to None (not checked).
+        verbose (bool): Print the st-flash commands and stream their output. Defaults to False.
     Returns:
         bool: True if flashing was successful, False otherwise.
     """
@@ -19,58 +93,78 @@ def flash_firmware(firmware_path, stlink_command=DEFAULT_STLINK_FLASH_COMMAND, a
         print(f"Error: Firmware file not found at '{firmware_path}'")
         return False
 
-    command_base = [stlink_command]
+    try:
+        stlink_path = _resolve_stlink_command(stlink_command)
+    except FileNotFoundError:
+        print(f"Error: Flashing command '{stlink_command}' not found. Is stlink-tools installed and in PATH?")
+        return False
+
+    if expected_crc32 is not None:
+        try:
+            firmware_crc32 = _firmware_crc32(firmware_path)
+        except OSError as e:
+            print(f"Error: Could not read firmware file '{firmware_path}': {e}")
+            return False
+        if firmware_crc32 != expected_crc32:
+            print(f"Error: Firmware file '{firmware_path}' has CRC32 0x{firmware_crc32:08X}, expected 0x{expected_crc32:08X}. Not flashing.")
+            return False
+        if verbose:
+            print(f"Firmware CRC32 0x{firmware_crc32:08X} matches the expected value.")
+
+    command_base = [stlink_path]
     if serial_number:
         command_base.extend(["--serial", serial_number])
     
     command = command_base + ["write", firmware_path, address]
     
     # Also prepare reset command if serial number is used
-    reset_command = [stlink_command]
+    reset_command = [stlink_path]
     if serial_number:
         reset_command.extend(["--serial", serial_number])
     reset_command.append("reset")
 
-    print(f"Attempting to flash STM32 with command: {' '.join(command)}")
+    if verbose:
+        print(f"Attempting to flash STM32 with command: {shlex.join(command)}")
     try:
-        process = subprocess.run(command, check=True, capture_output=True, text=True)
-        print("STM32 Flashing Output:")
-        if process.stdout:
-            print("STDOUT:\n" + process.stdout)
-        if process.stderr:
-             print("STDERR:\n" + process.stderr)
-        
-        if "verify success" in process.stderr.lower() or \
-           "flash written and verified successfully" in process.stderr.lower() or \
-           (process.returncode == 0 and "error" not in process.stderr.lower()):
-            print("Firmware successfully flashed to STM32.")
+        if verbose:
+            print("STM32 Flashing Output:")
+        return_code, success_seen, error_seen, output_tail = _stream_command(command, "st-flash", verbose)
+
+        if return_code != 0:
+            print("Error during STM32 flashing operation:")
+            print(f"Command: {shlex.join(command)}")
+            print(f"Return code: {return_code}")
+            if not verbose:
+                _print_output_tail("st-flash", output_tail)
+            return False
+
+        if success_seen or not error_seen:
+            if success_seen:
+                print("Firmware successfully flashed to STM32.")
+            else:
+                print("Warning: st-flash completed but success message not definitively found in output.")
+                print("Interpreting as success due to zero return code and no explicit error.")
             # Attempt reset after successful flash
-            try:
-                print(f"Attempting to reset STM32 with command: {' '.join(reset_command)}")
-                subprocess.run(reset_command, check=True, capture_output=True, text=True)
+            if verbose:
+                print(f"Attempting to reset STM32 with command: {shlex.join(reset_command)}")
+            reset_return_code, _, _, reset_output_tail = _stream_command(reset_command, "st-flash reset", verbose)
+            if reset_return_code == 0:
                 print("STM32 reset successfully.")
-            except subprocess.CalledProcessError as e_reset:
-                print(f"Error during STM32 reset after flashing: {e_reset.stderr}")
+            else:
+                print(f"Error during STM32 reset after flashing (Return code: {reset_return_code}).")
+                if not verbose:
+                    _print_output_tail("st-flash reset", reset_output_tail)
                 # Decide if this is critical; for now, flashing itself was a success.
             return True
-        else:
-            print("Warning: st-flash completed but success message not definitively found in output.")
-            if process.returncode == 0 and "error" not in process.stderr.lower():
-                print("Interpreting as success due to zero return code and no explicit error.")
-                return True
-            print("Flashing may have failed or had issues. Review output.")
-            return False
 
-    except subprocess.CalledProcessError as e:
-        print("Error during STM32 flashing operation:")
-        print(f"Command: {' '.join(e.cmd)}")
-        print(f"Return code: {e.returncode}")
-        print(f"STDOUT:\n{e.stdout}")
-        print(f"STDERR:\n{e.stderr}")
+        print("Flashing may have failed or had issues. Review output.")
+        if not verbose:
+            _print_output_tail("st-flash", output_tail)
         return False
+
     except FileNotFoundError:
         print(f"Error: Flashing command '{stlink_command}' not found. Is stlink-tools installed and in PATH?")
         return False
     except Exception as e:
         print(f"An unexpected error occurred during flashing: {e}")
-        return False 
\ No newline at end of file
+        return False
@@ -1,32 +1,77 @@
 # This file shall be used to receive contents over serial.
+import os
+import select
 import serial
 
 from signal import signal, SIGINT
-from sys import exit
-ser=serial.Serial(port="/dev/ttyACM0", baudrate=115200)
-read_values=""
+from sys import exit, stdout
+POLL_TIMEOUT=0.1    #seconds select waits for data before re-checking running, bounds Ctrl-C shutdown latency
+ser=serial.Serial(port="/dev/ttyACM0", baudrate=115200)    #read through its fd with select/readv, so no pyserial timeout is needed
 count=0     #counts the number of logs
+running=True    #cleared by the SIGINT handler, the main loop then shuts down
+BUF_SIZE=4096       #size of the recycled receive buffer, also the longest log handled in one piece
+buf=bytearray(BUF_SIZE)     #allocated once and reused for every read
+mv=memoryview(buf)
+filled=0    #number of bytes at the start of buf holding received data
+out=stdout
+FLUSH_EVERY=100     #logs written between explicit flushes of out
 def handler(signal_received, frame):
-    # Handle any cleanup here
-    print('SIGINT or CTRL-C detected. Exiting gracefully')
-    
-    ser.close()
-    exit(0)
+    # Only flag the shutdown here; closing the port mid-read can leave the USB endpoint stalled,
+    # so the main loop does the cleanup once select returns (at most POLL_TIMEOUT later)
+    global running
+    running=False
 
-def receive(read_values):       
-    read_values=ser.readline().decode()
-    
-def send(read_values):
-    read_list=read_values.split("_")
-    return read_list
+def receive(fd, filled):
+    # Wait for data, then read it straight into the free tail of buf with one syscall
+    ready,_,_=select.select([fd],[],[],POLL_TIMEOUT)
+    if ready:
+        received=os.readv(fd, [mv[filled:]])
+        if not received:
+            print('Serial device reported data but returned none (disconnected?). Exiting')
+            ser.close()
+            exit(1)
+        filled+=received
+    else:   #line went quiet, show whatever is still buffered
+        out.flush()
+    return filled
 
+def parse_line(start, end):
+    # Split buf[start:end] on "_", decoding each field directly from the buffer without an intermediate bytes copy
+    read_list=[]
+    while True:
+        sep=buf.find(b"_", start, end)
+        if sep==-1:
+            read_list.append(str(mv[start:end], "utf-8", "replace"))
+            return read_list
+        read_list.append(str(mv[start:sep], "utf-8", "replace"))
+        start=sep+1
 
 
-signal(SIGINT, handler)   
-while True:
-    receive(read_values)
-    count+=1
-    if read_values:
-        print(f"Log {count}")
-        print(send(read_values), end="\n")
 
+signal(SIGINT, handler)
+fd=ser.fileno()
+while running:
+    filled=receive(fd, filled)
+    start=0
+    end=buf.find(b"\n", start, filled)
+    while end!=-1:
+        count+=1
+        line_end=end-1 if end>start and buf[end-1]==0x0D else end   #drop the "\r" of "\r\n"
+        if line_end>start:
+            out.write(f"Log {count} {parse_line(start, line_end)}\n")
+            if count%FLUSH_EVERY==0:
+                out.flush()
+        start=end+1
+        end=buf.find(b"\n", start, filled)
+    if start:   #move the trailing partial log to the front for the next read
+        mv[:filled-start]=mv[start:filled]
+        filled-=start
+    elif filled==BUF_SIZE:  #log longer than the buffer, print what we have
+        count+=1
+        out.write(f"Log {count} {parse_line(0, filled)}\n")
+        filled=0
+
+out.flush()
+print('SIGINT or CTRL-C detected. Exiting gracefully')
+ser.close()
+exit(0)
@@ -1,15 +1,265 @@
 import argparse
+import compileall
+import concurrent.futures
+import contextlib
+import functools
 import subprocess
 import sys
 import os
 import json
+import multiprocessing
+import shlex
+import traceback
+
+from hil_tester.json_utils import load_json
+
+MAIN_RUNNER_CMD = [sys.executable, "-m", "hil_tester.main_runner"]
+
+_worker_shared_pins = None # SharedPinSequence of the --boards run this worker process belongs to
+
+def parse_boards(boards_arg):
+    """
+    Parses the --boards argument into a list of board dicts with 'stlink_serial' and 'serial_port' keys.
+    Accepts either a comma-separated list of STLINK_SERIAL[:SERIAL_PORT] entries
+    (e.g. '0669FF1:/dev/ttyACM0,0670AB2:/dev/ttyACM1') or a JSON list of objects
+    (e.g. '[{"stlink_serial": "0669FF1", "serial_port": "/dev/ttyACM0"}]').
+    With more than one board, every board must name its own serial port.
+    Raises ValueError if the argument is malformed.
+    """
+    boards = []
+    if boards_arg.lstrip().startswith("["):
+        try:
+            board_entries = json.loads(boards_arg)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Could not decode --boards JSON list: {e}")
+        for entry in board_entries:
+            if not isinstance(entry, dict) or not entry.get("stlink_serial"):
+                raise ValueError(f"Each --boards JSON entry must be an object with a 'stlink_serial' key. Got: {entry}")
+            serial_port = entry.get("serial_port")
+            if serial_port is not None and not isinstance(serial_port, str):
+                raise ValueError(f"'serial_port' in --boards JSON entry must be a string path. Got: {entry}")
+            boards.append({"stlink_serial": str(entry["stlink_serial"]), "serial_port": serial_port or None})
+    else:
+        for entry in boards_arg.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            stlink_serial, _, serial_port = entry.partition(":")
+            if not stlink_serial:
+                raise ValueError(f"Invalid --boards entry '{entry}'. Expected STLINK_SERIAL[:SERIAL_PORT].")
+            boards.append({"stlink_serial": stlink_serial, "serial_port": serial_port or None})
+
+    if not boards:
+        raise ValueError("No boards specified in --boards.")
+    stlink_serials = [board["stlink_serial"] for board in boards]
+    if len(set(stlink_serials)) != len(stlink_serials):
+        raise ValueError("Duplicate ST-Link serial numbers in --boards. Each board needs its own programmer.")
+    if len(boards) > 1:
+        # Falling back to --serial-port would make several boards read from the same port
+        missing_ports = [board["stlink_serial"] for board in boards if not board["serial_port"]]
+        if missing_ports:
+            raise ValueError(f"No serial port given in --boards for: {', '.join(missing_ports)}. Each board needs its own serial port.")
+        serial_ports = [board["serial_port"] for board in boards]
+        if len(set(serial_ports)) != len(serial_ports):
+            raise ValueError("Duplicate serial ports in --boards. Each board needs its own serial port.")
+    return boards
+
+def _is_crc32_hex(value):
+    """
+    Returns True if value is a string holding a 32-bit hex number, with or without a 0x prefix.
+    """
+    try:
+        return isinstance(value, str) and 0 <= int(value, 16) <= 0xFFFFFFFF
+    except ValueError:
+        return False
+
+@functools.lru_cache(maxsize=256)
+def _resolve_path(path, base=None):
+    """
+    Resolves a path from the test configuration relative to base (unless it is absolute or base is None).
+    Memoized, so fixtures shared by many tests in a batch are only normalized once.
+    """
+    return path if base is None or os.path.isabs(path) else os.path.normpath(os.path.join(base, path))
+
+@functools.lru_cache(maxsize=256)
+def _stat_path(path):
+    """
+    os.stat, cached for the current batch. Call _clear_path_caches() at the start of a batch so it sees current files.
+    """
+    return os.stat(path)
+
+def _clear_path_caches():
+    """
+    Drops memoized path resolutions and stat results from a previous batch.
+    """
+    _resolve_path.cache_clear()
+    _stat_path.cache_clear()
+
+def _resolve(path, base=None):
+    """
+    Resolves a path (see _resolve_path) and stats it once, so callers get both existence and size from a single syscall.
+    Returns a (resolved_path, stat_result) tuple. Raises FileNotFoundError (with .filename set) if it does not exist.
+    """
+    resolved_path = _resolve_path(path, base)
+    try:
+        return resolved_path, _stat_path(resolved_path)
+    except FileNotFoundError as e:
+        e.filename = resolved_path
+        raise
+
+def build_runner_args(args, firmware_path, input_values_path, expected_values_path, stlink_serial=None, serial_port=None,
+                      firmware_crc32=None):
+    """
+    Builds the hil_tester.main_runner arguments for a single board (without the interpreter/module prefix).
+    """
+    runner_args = [
+        "--code-to-test", firmware_path,
+        "--input-values", input_values_path,
+    ]
+
+    if expected_values_path:
+        runner_args.extend(["--expected-values", expected_values_path])
+    if firmware_crc32:
+        runner_args.extend(["--firmware-crc32", firmware_crc32])
+
+    # Add other pass-through arguments
+    if stlink_serial:
+        runner_args.extend(["--stlink-serial", stlink_serial])
+    if serial_port:
+        runner_args.extend(["--serial-port", serial_port])
+    if args.baud_rate:
+        runner_args.extend(["--baud-rate", str(args.baud_rate)])
+    if args.skip_flash:
+        runner_args.append("--skip-flash")
+    if args.st_flash_cmd:
+        runner_args.extend(["--st-flash-cmd", args.st_flash_cmd])
+    if args.flash_address:
+        runner_args.extend(["--flash-address", args.flash_address])
+    if args.gpio_mode:
+        runner_args.extend(["--gpio-mode", args.gpio_mode])
+    if args.receive_timeout:
+        runner_args.extend(["--receive-timeout", str(args.receive_timeout)])
+    if args.verbose:
+        runner_args.append("--verbose")
+    return runner_args
+
+def _prepare_pycache(prefix, package_dir):
+    """
+    Points bytecode caching at a shared prefix directory and precompiles the hil_tester package there,
+    so every main_runner interpreter (and every board) loads the same up-to-date .pyc files.
+    Returns True if the prefix is usable, False if it could not be created or is not writable.
+    """
+    try:
+        os.makedirs(prefix, exist_ok=True)
+    except OSError:
+        return False
+    if not os.access(prefix, os.W_OK):
+        return False
+    sys.pycache_prefix = prefix
+    compileall.compile_dir(package_dir, quiet=1)
+    return True
+
+class SharedPinSequence:
+    """
+    Drives the input_values pin sequence once for every board of a --boards run, since all boards are wired to
+    the same Raspberry Pi pins. Workers call board_ready() once their board is flashed and its serial port is open;
+    the parent waits for every board (or for it to drop out), drives the pins with its one GPIOController
+    and holds them until all boards have finished receiving.
+    """
+    def __init__(self):
+        self._boards_ready = multiprocessing.Semaphore(0)
+        self._pins_driven = multiprocessing.Event()
+        self._pins_ok = multiprocessing.Value("b", 0)
+        self._reported = False # Per worker process: whether the current board has been counted yet
+
+    def start_board(self):
+        self._reported = False
+
+    def board_ready(self):
+        """Worker side: counts this board as ready and blocks until the pins are driven. Returns True on success."""
+        self._report()
+        self._pins_driven.wait()
+        return bool(self._pins_ok.value)
+
+    def end_board(self):
+        """Worker side: counts a board that dropped out (e.g. failed flashing) before reaching board_ready()."""
+        self._report()
+
+    def _report(self):
+        if not self._reported:
+            self._reported = True
+            self._boards_ready.release()
+
+    def wait_for_boards(self, futures):
+        """Parent side: waits until every board is ready or has dropped out, or their worker processes are gone."""
+        reported = 0
+        while reported < len(futures):
+            if self._boards_ready.acquire(timeout=0.5):
+                reported += 1
+            elif all(future.done() for future in futures):
+                break
+
+    def finish(self, pins_ok):
+        """Parent side: releases the waiting boards, telling them whether the pin sequence succeeded."""
+        self._pins_ok.value = int(pins_ok)
+        self._pins_driven.set()
+
+def _init_worker(shared_pins):
+    """
+    ProcessPoolExecutor initializer: hands the run's SharedPinSequence to the worker process.
+    """
+    global _worker_shared_pins
+    _worker_shared_pins = shared_pins
+
+def _drive_shared_pins(gpio_ctrl, input_values_path, shared_pins, futures):
+    """
+    Waits for the boards of a --boards run and drives their shared pins once. The pins stay configured
+    until gpio_ctrl is cleaned up, after every board has finished. The boards are always released, even on errors.
+    """
+    from hil_tester.pin_emulator import emulate_hw_pins_from_file
+    pins_ok = False
+    try:
+        shared_pins.wait_for_boards(futures)
+        if gpio_ctrl is not None:
+            print(f"--- Emulating Hardware Pin Inputs for all {len(futures)} boards ---")
+            pins_ok = emulate_hw_pins_from_file(input_values_path, gpio_ctrl) is not None
+    except Exception as e:
+        print(f"Error while emulating the shared hardware pin inputs: {e}")
+    finally:
+        shared_pins.finish(pins_ok)
+
+def run_one(job):
+    """
+    Runs hil_tester.main_runner in this worker process for a single board, with the pins driven by the parent.
+    Its stdout/stderr goes to the board's log file. Returns a (stlink_serial, return_code) tuple.
+    """
+    from hil_tester import main_runner # Preloaded by the parent before forking, so this is a dict lookup
+    _worker_shared_pins.start_board()
+    with open(job["log_path"], "w") as log_file, \
+         contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+        try:
+            main_runner.main(job["argv"], shared_pins=_worker_shared_pins)
+            return_code = 0
+        except SystemExit as e: # main_runner always finishes through sys.exit
+            return_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            return_code = 1
+        finally:
+            _worker_shared_pins.end_board() # The parent must not wait on a board that never got ready
+    return job["stlink_serial"], return_code
 
 def main():
     parser = argparse.ArgumentParser(description="Run HIL tests using a JSON configuration file.")
     parser.add_argument("test_script", help="Path to the JSON test configuration file. This file should define 'code_to_test', 'input_values', and optionally 'expected_values'.")
     parser.add_argument("--input-values", help="Path to JSON for hardware input actions. Overrides 'input_values' in the test_script JSON.")
     parser.add_argument("--expected-values", help="Path to JSON for expected serial output. Overrides 'expected_values' in the test_script JSON. If not provided here or in JSON, output checking is skipped by main_runner.")
-    parser.add_argument("--board", help="Specify the board to use (maps to ST-Link serial number).")
+    board_group = parser.add_mutually_exclusive_group()
+    board_group.add_argument("--board", help="Specify the board to use (maps to ST-Link serial number).")
+    board_group.add_argument("--boards", help="Run the test on several boards in parallel. Comma-separated STLINK_SERIAL[:SERIAL_PORT] entries (SERIAL_PORT is required when more than one board is given) or a JSON list of {\"stlink_serial\", \"serial_port\"} objects.")
+    parser.add_argument("--log-dir", default="logs", help="Directory for per-board log files when using --boards.")
+    parser.add_argument("--pycache-prefix", help="Optional directory for hil_tester bytecode, precompiled there before main_runner starts (e.g. when the source tree is read-only). By default the normal __pycache__ directories are used.")
+    parser.add_argument("--capture", action="store_true", help="Single board only: run main_runner as a child process and print its captured output afterwards, instead of replacing this process with it.")
     # Add other arguments that might be useful to expose from hil_tester.main_runner
     parser.add_argument("--serial-port", help="Serial port for STM32 communication.")
     parser.add_argument("--baud-rate", type=int, help="Baud rate for serial communication.")
@@ -18,8 +268,10 @@ def main():
     parser.add_argument("--flash-address", help="Flash memory address for st-flash.")
     parser.add_argument("--gpio-mode", choices=["BCM", "BOARD"], help="GPIO pin numbering mode (BCM or BOARD).")
     parser.add_argument("--receive-timeout", type=int, help="Overall timeout in seconds for receiving serial data.")
+    parser.add_argument("--verbose", action="store_true", help="Print the main_runner commands and pass --verbose through to main_runner.")
 
     args = parser.parse_args()
+    _clear_path_caches() # Start of a batch: do not trust stat results from an earlier one
 
     # Validate and parse the JSON test script
     if not os.path.exists(args.test_script):
@@ -28,8 +280,8 @@ def main():
 
     config_dir = os.path.dirname(os.path.abspath(args.test_script))
     try:
-        with open(args.test_script, 'r') as f:
-            test_config = json.load(f)
+        with open(args.test_script, 'rb') as f:
+            test_config = load_json(f)
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON test configuration file '{args.test_script}': {e}")
         sys.exit(1)
@@ -37,88 +289,161 @@ def main():
         print(f"Error reading test configuration file '{args.test_script}': {e}")
         sys.exit(1)
 
+    # Fail fast on malformed configs instead of tripping over wrong types further down
+    if not isinstance(test_config, dict):
+        print(f"Error: Test configuration file '{args.test_script}' must contain a JSON object.")
+        sys.exit(1)
+    for field in ("code_to_test", "input_values", "expected_values"):
+        if test_config.get(field) is not None and not isinstance(test_config[field], str):
+            print(f"Error: '{field}' in '{args.test_script}' must be a string path. Got: {test_config[field]!r}")
+            sys.exit(1)
+    firmware_crc32 = test_config.get("code_to_test_crc32") # Optional, checked by the flasher before writing
+    if firmware_crc32 is not None and not _is_crc32_hex(firmware_crc32):
+        print(f"Error: 'code_to_test_crc32' in '{args.test_script}' must be a hex string (e.g. \"0x1A2B3C4D\"). Got: {firmware_crc32!r}")
+        sys.exit(1)
+
     # Determine paths for code_to_test, input_values, and expected_values
     # 1. Firmware path (code_to_test) - must be in JSON
     firmware_path_from_json = test_config.get("code_to_test")
     if not firmware_path_from_json:
         print(f"Error: 'code_to_test' not found in '{args.test_script}'. This is a required field.")
         sys.exit(1)
-    actual_firmware_path = firmware_path_from_json if os.path.isabs(firmware_path_from_json) else os.path.normpath(os.path.join(config_dir, firmware_path_from_json))
-    if not os.path.exists(actual_firmware_path):
-        print(f"Error: Firmware file '{actual_firmware_path}' (from 'code_to_test' in JSON) not found.")
+    try:
+        actual_firmware_path, firmware_stat = _resolve(firmware_path_from_json, config_dir)
+    except FileNotFoundError as e:
+        print(f"Error: Firmware file '{e.filename}' (from 'code_to_test' in JSON) not found.")
+        sys.exit(1)
+    if firmware_stat.st_size == 0 and not args.skip_flash:
+        print(f"Error: Firmware file '{actual_firmware_path}' (from 'code_to_test' in JSON) is empty.")
         sys.exit(1)
 
     # 2. Input values path
     input_values_path_from_json = test_config.get("input_values")
     actual_input_values_path = None
-    if args.input_values:
-        actual_input_values_path = args.input_values # Assumed relative to CWD or absolute
-        if not os.path.exists(actual_input_values_path): # Check existence for CLI provided path
-             print(f"Error: Input values file '{actual_input_values_path}' (from --input-values argument) not found.")
-             sys.exit(1)
-    elif input_values_path_from_json:
-        actual_input_values_path = input_values_path_from_json if os.path.isabs(input_values_path_from_json) else os.path.normpath(os.path.join(config_dir, input_values_path_from_json))
-        if not os.path.exists(actual_input_values_path):
-            print(f"Error: Input values file '{actual_input_values_path}' (from 'input_values' in JSON) not found.")
+    try:
+        if args.input_values:
+            source = "--input-values argument"
+            actual_input_values_path, _ = _resolve(args.input_values) # Assumed relative to CWD or absolute
+        elif input_values_path_from_json:
+            source = "'input_values' in JSON"
+            actual_input_values_path, _ = _resolve(input_values_path_from_json, config_dir)
+        else:
+            print(f"Error: 'input_values' not found in '{args.test_script}' and not provided via --input-values. This is required.")
             sys.exit(1)
-    else:
-        print(f"Error: 'input_values' not found in '{args.test_script}' and not provided via --input-values. This is required.")
+    except FileNotFoundError as e:
+        print(f"Error: Input values file '{e.filename}' (from {source}) not found.")
         sys.exit(1)
-    
+
     # 3. Expected values path (optional)
     expected_values_path_from_json = test_config.get("expected_values")
     actual_expected_values_path = None
-    if args.expected_values:
-        actual_expected_values_path = args.expected_values # Assumed relative to CWD or absolute
-        if not os.path.exists(actual_expected_values_path): # Check existence for CLI provided path
-            print(f"Error: Expected values file '{actual_expected_values_path}' (from --expected-values argument) not found.")
+    try:
+        if args.expected_values:
+            source = "--expected-values argument"
+            actual_expected_values_path, _ = _resolve(args.expected_values) # Assumed relative to CWD or absolute
+        elif expected_values_path_from_json:
+            source = "'expected_values' in JSON"
+            actual_expected_values_path, _ = _resolve(expected_values_path_from_json, config_dir)
+    except FileNotFoundError as e:
+        print(f"Error: Expected values file '{e.filename}' (from {source}) not found.")
+        sys.exit(1)
+
+    workspace_root = os.path.dirname(os.path.abspath(__file__))
+    use_pycache_prefix = bool(args.pycache_prefix) and _prepare_pycache(args.pycache_prefix, os.path.join(workspace_root, "hil_tester"))
+    if args.pycache_prefix and not use_pycache_prefix:
+        print(f"Warning: Bytecode cache directory '{args.pycache_prefix}' is not writable. Using default __pycache__ directories.")
+
+    if args.boards:
+        try:
+            boards = parse_boards(args.boards)
+        except ValueError as e:
+            print(f"Error: {e}")
             sys.exit(1)
-    elif expected_values_path_from_json:
-        actual_expected_values_path = expected_values_path_from_json if os.path.isabs(expected_values_path_from_json) else os.path.normpath(os.path.join(config_dir, expected_values_path_from_json))
-        if not os.path.exists(actual_expected_values_path):
-            print(f"Error: Expected values file '{actual_expected_values_path}' (from 'expected_values' in JSON) not found.")
+
+        try:
+            os.makedirs(args.log_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating log directory '{args.log_dir}': {e}")
             sys.exit(1)
 
+        jobs = []
+        for board in boards:
+            board_args = build_runner_args(args, actual_firmware_path, actual_input_values_path, actual_expected_values_path,
+                                           stlink_serial=board["stlink_serial"],
+                                           serial_port=board["serial_port"] or args.serial_port,
+                                           firmware_crc32=firmware_crc32)
+            log_path = os.path.join(args.log_dir, f"{board['stlink_serial']}.log")
+            if args.verbose:
+                print(f"Board {board['stlink_serial']}: main_runner {shlex.join(board_args)} (log: {log_path})")
+            jobs.append({"stlink_serial": board["stlink_serial"], "argv": board_args, "log_path": log_path})
+
+        # Flashing and serial capture are dominated by USB/IO wait, so one worker per programmer scales well.
+        # Each worker runs main_runner in-process and only flashes and receives. All boards share the same
+        # input_values pins, so this process drives them once, with one GPIOController, after every board is ready.
+        # That needs every board in flight at once, so there is one worker per board rather than per CPU.
+        max_workers = len(jobs)
+        # Import main_runner and its submodules once here; forked workers inherit them instead of each re-importing
+        import hil_tester.main_runner
+        from hil_tester.gpio_controller import GPIOController, GPIOControllerError
+        print(f"Running HIL test on {len(jobs)} boards with {max_workers} parallel workers...")
+        shared_pins = SharedPinSequence()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                    initargs=(shared_pins,)) as executor:
+            future_jobs = {executor.submit(run_one, job): job for job in jobs}
+            try:
+                gpio_ctrl = GPIOController(mode_str=args.gpio_mode or "BCM")
+            except GPIOControllerError as e:
+                print(f"Fatal GPIO Initialization Error: {e}")
+                gpio_ctrl = None
+            with gpio_ctrl if gpio_ctrl is not None else contextlib.nullcontext():
+                _drive_shared_pins(gpio_ctrl, actual_input_values_path, shared_pins, list(future_jobs))
+                return_codes = {}
+                for future in concurrent.futures.as_completed(future_jobs):
+                    stlink_serial = future_jobs[future]["stlink_serial"]
+                    try:
+                        _, return_codes[stlink_serial] = future.result()
+                    except Exception as e: # e.g. BrokenProcessPool when a worker process died mid-run
+                        print(f"Error: Board {stlink_serial} did not complete: {e!r}")
+                        return_codes[stlink_serial] = 2
+        results = [(job["stlink_serial"], return_codes[job["stlink_serial"]]) for job in jobs]
+
+        print("--- Multi-Board Results ---")
+        log_paths = {job["stlink_serial"]: job["log_path"] for job in jobs}
+        for stlink_serial, return_code in results:
+            status = "PASSED" if return_code == 0 else f"FAILED (Return Code: {return_code})"
+            print(f"  Board {stlink_serial}: {status} (log: {log_paths[stlink_serial]})")
+        num_passed = sum(1 for _, return_code in results if return_code == 0)
+        print(f"--- Multi-Board Run Complete: {num_passed}/{len(results)} boards passed ---")
+        sys.exit(max(return_code for _, return_code in results))
+
+    env = os.environ.copy()
+    if "PYTHONPATH" in env:
+        env["PYTHONPATH"] = workspace_root + os.pathsep + env["PYTHONPATH"]
+    else:
+        env["PYTHONPATH"] = workspace_root
+    if use_pycache_prefix:
+        env["PYTHONPYCACHEPREFIX"] = args.pycache_prefix
+
     # Construct the command for hil_tester.main_runner
-    cmd = [
-        sys.executable,
-        "-m",
-        "hil_tester.main_runner",
-        "--code-to-test", actual_firmware_path,
-        "--input-values", actual_input_values_path,
-    ]
+    cmd = MAIN_RUNNER_CMD + build_runner_args(args, actual_firmware_path, actual_input_values_path, actual_expected_values_path,
+                                              stlink_serial=args.board, serial_port=args.serial_port,
+                                              firmware_crc32=firmware_crc32)
 
-    if actual_expected_values_path:
-        cmd.extend(["--expected-values", actual_expected_values_path])
+    if args.verbose:
+        print(f"Executing command: {shlex.join(cmd)}")
 
-    # Add other pass-through arguments
-    if args.board:
-        cmd.extend(["--stlink-serial", args.board])
-    if args.serial_port:
-        cmd.extend(["--serial-port", args.serial_port])
-    if args.baud_rate:
-        cmd.extend(["--baud-rate", str(args.baud_rate)])
-    if args.skip_flash:
-        cmd.append("--skip-flash")
-    if args.st_flash_cmd:
-        cmd.extend(["--st-flash-cmd", args.st_flash_cmd])
-    if args.flash_address:
-        cmd.extend(["--flash-address", args.flash_address])
-    if args.gpio_mode:
-        cmd.extend(["--gpio-mode", args.gpio_mode])
-    if args.receive_timeout:
-        cmd.extend(["--receive-timeout", str(args.receive_timeout)])
-    
-    print(f"Executing command: {' '.join(cmd)}")
+    if not args.capture:
+        # Become main_runner instead of spawning it, saving a second interpreter start-up.
+        # Its output then goes straight to this terminal and its exit code is ours.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execvpe(cmd[0], cmd, env)
+        except OSError as e:
+            print(f"Error: Could not start the Python interpreter '{sys.executable}' for 'hil_tester.main_runner': {e}")
+            sys.exit(1)
 
     try:
-        env = os.environ.copy()
-        workspace_root = os.path.dirname(os.path.abspath(__file__))
-        if "PYTHONPATH" in env:
-            env["PYTHONPATH"] = workspace_root + os.pathsep + env["PYTHONPATH"]
-        else:
-            env["PYTHONPATH"] = workspace_root
-
         result = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
         print("--- Test Runner Output ---")
         print(result.stdout)